@@ -1,16 +1,21 @@
 # /opt/fs_api/app.py
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from itertools import islice
+from typing import Optional
 from pathlib import Path
 import shutil
 import os
 import fnmatch
+import re
 import stat
 import json
 from tempfile import SpooledTemporaryFile
 
+from fs_index import (LIST_FIELDS, LIST_MAX_DEPTH, SEARCH_LIMIT, file_indexes,
+                      list_fields, list_page)
+
 BASE_PATH = Path("/").resolve()  # Tighten this if you want a chroot-like view
 
 def get_safe_path(requested_path: str) -> Path:
@@ -35,28 +40,75 @@ app.add_middleware(
 
 # ---------- Browsing ---------------------------------------------------------
 @app.get("/list")
-def list_directory(path: str = "/"):
+def list_directory(
+    path: str = "/",
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Page size; enables the paged response"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of " + ",".join(LIST_FIELDS)),
+    depth: int = Query(1, ge=1, le=LIST_MAX_DEPTH, description="Levels to descend (1 = this directory only)"),
+):
+    """
+    Entries of a directory, directories first. Without `limit`/`cursor` the
+    plain list is returned as before; otherwise {"entries", "next_cursor"}.
+    """
     directory = get_safe_path(path)
     if not directory.is_dir():
         raise HTTPException(status_code=400, detail="Not a directory")
-    return [
-        {
-            "name": file_path.name,
-            "is_dir": file_path.is_dir(),
-            "size": file_path.stat().st_size,
-            "mtime": file_path.stat().st_mtime,
-        }
-        for file_path in sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-    ]
+    rel = str(directory.relative_to(BASE_PATH))
+    try:
+        want = list_fields(fields, depth)
+        entries, next_cursor = list_page(str(directory), "" if rel == "." else rel,
+                                         depth, want, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if limit is None and cursor is None:
+        return entries
+    return {"entries": entries, "next_cursor": next_cursor}
+
 
 @app.get("/search")
-def search_files(pattern: str = "main.py", path: str = "/"):
+def search_files(
+    pattern: str = "main.py",
+    path: str = "/",
+    mode: str = Query("glob", pattern="^(glob|regex)$",
+                      description="glob: matched against the name, or the relative path when it contains '/'; "
+                                  "regex: searched in the path relative to `path`"),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=100000),
+):
+    """
+    Paths (relative to the base) below `path` matching `pattern`, answered from
+    the file index and streamed as a JSON array of at most `limit` entries.
+    """
     root_directory = get_safe_path(path)
-    search_results: List[str] = []
-    for file_path in root_directory.rglob("*"):
-        if fnmatch.fnmatch(file_path.name, pattern):
-            search_results.append(str(file_path.relative_to(BASE_PATH)))
-    return search_results
+    if not root_directory.is_dir():
+        raise HTTPException(status_code=400, detail="Not a directory")
+    try:
+        if mode == "regex":
+            match = re.compile(pattern).search
+        else:
+            glob = re.compile(fnmatch.translate(pattern)).match
+            match = glob if "/" in pattern else (lambda rel: glob(rel.rsplit("/", 1)[-1]))
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid pattern: {e}")
+    index, sub = file_indexes.for_path(str(root_directory))
+    prefix = str(Path(index.root).relative_to(BASE_PATH))
+    prefix = "" if prefix == "." else prefix + "/"
+
+    def body():
+        yield "["
+        for n, found in enumerate(islice(index.search(sub, match), limit)):
+            yield ("," if n else "") + json.dumps(prefix + found)
+        yield "]"
+    return StreamingResponse(body(), media_type="application/json",
+                             headers={"X-Index-Entries": str(len(index.paths))})
+
+@app.get("/search/index")
+def search_index_status():
+    """
+    Roots currently indexed for /search with size, build/refresh timings and
+    the exclude rules in effect.
+    """
+    return file_indexes.snapshot()
 
 # ---------- File operations --------------------------------------------------
 @app.get("/cat", response_class=PlainTextResponse)
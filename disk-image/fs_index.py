@@ -0,0 +1,313 @@
+"""
+fs_index.py – directory listing (/list) and the path index behind /search,
+shared by file_system_api.py and vibe_backend.py. Each process keeps its
+own listing cache and `file_indexes`.
+"""
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+import base64
+import fnmatch
+import json
+import os
+import sys
+import threading
+import time
+
+# ---------- Browsing ---------------------------------------------------------
+LIST_CACHE_TTL     = 2.0    # seconds a listing is reused while the directory mtime is unchanged
+LIST_CACHE_DIRS    = 256
+LIST_FIELDS        = ("name", "path", "is_dir", "size", "mtime")
+LIST_MAX_DEPTH     = 8
+
+_list_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_list_lock = threading.Lock()
+
+def scan_dir(directory: str) -> tuple:
+    """
+    (sort keys, rows) for one directory – directories first, then by name –
+    built with os.scandir so each entry costs one (cached) stat. Reused for
+    LIST_CACHE_TTL seconds as long as the directory's mtime has not changed.
+    """
+    mtime_ns = os.stat(directory).st_mtime_ns
+    now = time.monotonic()
+    with _list_lock:
+        hit = _list_cache.get(directory)
+        if hit and hit[0] == mtime_ns and now - hit[1] < LIST_CACHE_TTL:
+            _list_cache.move_to_end(directory)
+            return hit[2], hit[3]
+    rows = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+                info = entry.stat()
+            except OSError:                 # dangling symlink or vanished entry
+                try:
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                is_dir = False
+            rows.append(((int(not is_dir), entry.name.lower(), entry.name),
+                         entry.name, is_dir, info.st_size, info.st_mtime, entry.is_symlink()))
+    rows.sort(key=lambda r: r[0])
+    keys = [r[0] for r in rows]
+    with _list_lock:
+        _list_cache[directory] = (mtime_ns, now, keys, rows)
+        _list_cache.move_to_end(directory)
+        while len(_list_cache) > LIST_CACHE_DIRS:
+            _list_cache.popitem(last=False)
+    return keys, rows
+
+def walk_listing(directory: str, rel: str, depth: int, after: Optional[tuple]):
+    """
+    Yield (key, row) in pre-order down to `depth` levels, starting after the
+    entry whose key path is `after`. Keys are tuples of per-level sort keys,
+    so they order exactly like the traversal and make a stable cursor.
+    """
+    def walk(dir_path: str, rel_dir: str, prefix: tuple, level: int):
+        keys, rows = scan_dir(dir_path)
+        on_path = after is not None and len(after) > len(prefix) and after[:len(prefix)] == prefix
+        start = bisect_left(keys, after[len(prefix)]) if on_path else 0
+        for sort_key, name, is_dir, size, mtime, link in rows[start:]:
+            key  = prefix + (sort_key,)
+            path = f"{rel_dir}/{name}" if rel_dir else name
+            if not (on_path and key == after[:len(key)]):
+                yield key, {"name": name, "path": path, "is_dir": is_dir, "size": size, "mtime": mtime}
+            if is_dir and not link and level < depth:
+                try:
+                    yield from walk(os.path.join(dir_path, name), path, key, level + 1)
+                except OSError:
+                    continue                # unreadable subdirectory
+    yield from walk(directory, rel, (), 1)
+
+def encode_list_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_list_cursor(cursor: str) -> tuple:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return tuple((int(k[0]), str(k[1]), str(k[2])) for k in raw)
+    except (ValueError, TypeError, IndexError):
+        raise ValueError("Invalid cursor")
+
+def list_fields(fields: Optional[str], depth: int) -> tuple:
+    """Fields to project for `fields` (comma-separated); the default adds `path` when recursing."""
+    if fields is None:
+        return ("name", "is_dir", "size", "mtime") + (("path",) if depth > 1 else ())
+    want = tuple(f for f in fields.split(",") if f)
+    unknown = set(want) - set(LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return want
+
+def list_page(directory: str, rel: str, depth: int, want: tuple,
+              limit: Optional[int], cursor: Optional[str]) -> tuple:
+    """
+    (entries projected to `want`, next_cursor) for up to `limit` entries after
+    `cursor`. Raises ValueError for a cursor it did not hand out.
+    """
+    after = decode_list_cursor(cursor) if cursor else None
+    entries, next_cursor, last = [], None, None
+    for key, row in walk_listing(directory, rel, depth, after):
+        if limit is not None and len(entries) >= limit:
+            next_cursor = encode_list_cursor(last)
+            break
+        entries.append({f: row[f] for f in want})
+        last = key
+    return entries, next_cursor
+
+# ---------- Search index -----------------------------------------------------
+SEARCH_EXCLUDE     = [p.strip() for p in os.environ.get("VIBE_SEARCH_EXCLUDE", "node_modules,.git,/proc,/sys").split(",")
+                      if p.strip()]    # name globs, or absolute paths when starting with "/"
+SEARCH_MAX_AGE     = float(os.environ.get("VIBE_SEARCH_MAX_AGE", "5"))       # s before a query re-validates
+SEARCH_RESCAN      = float(os.environ.get("VIBE_SEARCH_RESCAN", "30"))       # s between background rescans
+SEARCH_IDLE_TTL    = float(os.environ.get("VIBE_SEARCH_IDLE_TTL", "900"))    # s before an unused index is dropped
+SEARCH_MAX_INDEXES = 8
+SEARCH_LIMIT       = 10000
+
+def _join(rel: str, name: str) -> str:
+    return f"{rel}/{name}" if rel else name
+
+class FileIndex:
+    """
+    Sorted table of every path below `root` (relative, '/'-separated) plus the
+    mtime and children of each indexed directory. A refresh stats every
+    directory and re-reads only those whose mtime moved, so creates, deletes
+    and renames anywhere in the tree are picked up without a full walk.
+    """
+    def __init__(self, root: str, exclude: List[str] = SEARCH_EXCLUDE):
+        self.root      = root
+        self._names    = [p for p in exclude if not p.startswith("/")]
+        self._absolute = {p.rstrip("/") for p in exclude if p.startswith("/")}
+        self._lock     = threading.Lock()
+        self._dirs: Dict[str, tuple] = {}      # rel dir -> (mtime_ns, {name: is_dir})
+        self.paths: List[str] = []             # replaced, never mutated, so readers need no lock
+        self.state     = "new"
+        self.built_at  = self.refreshed_at = 0.0
+        self.build_seconds = self.refresh_seconds = 0.0
+        self.changes   = 0
+        self.last_used = time.monotonic()
+        self._checked  = 0.0
+
+    def _excluded(self, rel: str, name: str) -> bool:
+        if any(fnmatch.fnmatchcase(name, p) for p in self._names):
+            return True
+        return bool(self._absolute) and os.path.join(self.root, rel, name) in self._absolute
+
+    def _read_dir(self, rel: str) -> tuple:
+        path = os.path.join(self.root, rel)
+        with os.scandir(path) as it:
+            kids = {e.name: e.is_dir(follow_symlinks=False) for e in it if not self._excluded(rel, e.name)}
+        return os.stat(path).st_mtime_ns, kids
+
+    def _scan(self, rel: str, out: List[str]):
+        """Index the subtree at `rel`, appending its paths (not `rel` itself) to `out`."""
+        stack = [rel]
+        while stack:
+            rel = stack.pop()
+            try:
+                self._dirs[rel] = snap = self._read_dir(rel)
+            except OSError:
+                continue                        # unreadable: listed by its parent, not descended
+            for name, is_dir in snap[1].items():
+                out.append(_join(rel, name))
+                if is_dir:
+                    stack.append(_join(rel, name))
+
+    def _drop(self, rel: str):
+        snap = self._dirs.pop(rel, None)
+        for name, is_dir in (snap[1].items() if snap else ()):
+            if is_dir:
+                self._drop(_join(rel, name))
+
+    def _build(self):
+        start = time.monotonic()
+        self._dirs, paths = {}, []
+        self._scan("", paths)
+        paths.sort()
+        self.paths, self.state = paths, "ready"
+        self.built_at = self.refreshed_at = time.time()
+        self.build_seconds = round(time.monotonic() - start, 3)
+
+    def _refresh(self):
+        start = time.monotonic()
+        changed = []
+        for rel, (mtime_ns, _) in list(self._dirs.items()):
+            try:
+                if os.stat(os.path.join(self.root, rel)).st_mtime_ns != mtime_ns:
+                    changed.append(rel)
+            except OSError:
+                continue                        # gone: its parent's mtime moved as well
+        added, removed, subtrees = [], set(), []
+        for rel in sorted(changed, key=lambda r: r.count("/") + bool(r)):   # parents first
+            if rel not in self._dirs:
+                continue                        # inside a subtree dropped above
+            old = self._dirs[rel][1]
+            try:
+                snap = self._read_dir(rel)
+            except OSError:
+                continue
+            self._dirs[rel] = snap
+            for name, is_dir in old.items():
+                if snap[1].get(name) != is_dir:
+                    removed.add(_join(rel, name))
+                    if is_dir:
+                        subtrees.append(_join(rel, name) + "/")
+                        self._drop(_join(rel, name))
+            for name, is_dir in snap[1].items():
+                if old.get(name) != is_dir:
+                    added.append(_join(rel, name))
+                    if is_dir:
+                        self._scan(_join(rel, name), added)
+        if removed or added:
+            prefixes = tuple(subtrees)
+            paths = [p for p in self.paths if p not in removed and not (prefixes and p.startswith(prefixes))]
+            self.paths = sorted(paths + added)
+            self.changes += len(removed) + len(added)
+        self.refreshed_at = time.time()
+        self.refresh_seconds = round(time.monotonic() - start, 3)
+
+    def ensure(self, max_age: float = SEARCH_MAX_AGE):
+        """Build on first use; afterwards re-validate when the last check is older than `max_age`."""
+        with self._lock:
+            if self.state == "new":
+                self._build()
+            elif time.monotonic() - self._checked > max_age:
+                self._refresh()
+            else:
+                return
+            self._checked = time.monotonic()
+
+    def search(self, sub: str, match) -> Iterator[str]:
+        """Paths below `sub` ('' for the whole root) accepted by match(path relative to sub)."""
+        paths = self.paths
+        lo, hi, cut = 0, len(paths), 0
+        if sub:
+            lo, hi, cut = bisect_left(paths, sub + "/"), bisect_left(paths, sub + "0"), len(sub) + 1
+        for i in range(lo, hi):
+            if match(paths[i][cut:]):
+                yield paths[i]
+
+    def snapshot(self) -> Dict:
+        return {
+            "root": self.root, "state": self.state, "entries": len(self.paths),
+            "directories": len(self._dirs), "built_at": self.built_at,
+            "build_seconds": self.build_seconds, "refreshed_at": self.refreshed_at,
+            "refresh_seconds": self.refresh_seconds, "changes": self.changes,
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+        }
+
+class FileIndexes:
+    """
+    One FileIndex per searched root. A search under an already indexed root
+    reuses that index; indexing an ancestor replaces the indexes below it.
+    A background thread rescans every SEARCH_RESCAN seconds and drops
+    indexes nobody has searched for SEARCH_IDLE_TTL seconds.
+    """
+    def __init__(self, max_indexes: int = SEARCH_MAX_INDEXES):
+        self.max_indexes = max_indexes
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, FileIndex] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def for_path(self, directory: str) -> tuple:
+        """(index, path of `directory` inside it) – built or re-validated as needed."""
+        with self._lock:
+            index = next((idx for root, idx in self._indexes.items()
+                          if directory == root or directory.startswith(root.rstrip("/") + "/")), None)
+            if index is None:
+                for root in [r for r in self._indexes if r.startswith(directory.rstrip("/") + "/")]:
+                    del self._indexes[root]
+                while len(self._indexes) >= self.max_indexes:
+                    del self._indexes[min(self._indexes, key=lambda r: self._indexes[r].last_used)]
+                index = self._indexes[directory] = FileIndex(directory)
+            index.last_used = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="file-index", daemon=True)
+                self._thread.start()
+        index.ensure()
+        sub = os.path.relpath(directory, index.root)
+        return index, "" if sub == "." else sub
+
+    def _run(self):
+        while True:
+            time.sleep(SEARCH_RESCAN)
+            with self._lock:
+                for root in [r for r, idx in self._indexes.items()
+                             if time.monotonic() - idx.last_used > SEARCH_IDLE_TTL]:
+                    del self._indexes[root]
+                indexes = list(self._indexes.values())
+            for index in indexes:
+                try:
+                    index.ensure(max_age=0)
+                except Exception as e:
+                    sys.stderr.write(f"[file-index] rescan of {index.root} failed: {e}\n")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            indexes = list(self._indexes.values())
+        return {"exclude": SEARCH_EXCLUDE, "rescan_seconds": SEARCH_RESCAN,
+                "indexes": [idx.snapshot() for idx in indexes]}
+
+file_indexes = FileIndexes()
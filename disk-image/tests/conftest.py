@@ -0,0 +1,42 @@
+"""
+Shared fixtures. The gateway keeps all state below ROOT, so the whole
+suite imports it against a throw-away VIBE_ROOT.
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+_ROOT = Path(tempfile.mkdtemp(prefix="vibe-tests-"))
+(_ROOT / "system_prompt.json").write_text(json.dumps({"system_prompt": "test"}))
+os.environ["VIBE_ROOT"] = str(_ROOT)
+os.environ["PATH"] = f"{HERE / 'bin'}{os.pathsep}{os.environ['PATH']}"
+sys.path.insert(0, str(HERE.parent))
+
+import vibe_backend  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def vb():
+    return vibe_backend
+
+
+@pytest.fixture
+def client():
+    return TestClient(vibe_backend.app)
+
+
+@pytest.fixture(scope="session")
+def fsapi():
+    import file_system_api
+    return file_system_api
+
+
+@pytest.fixture
+def fs_client(fsapi):
+    return TestClient(fsapi.app)
@@ -0,0 +1,112 @@
+import json
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def conv_dir(vb):
+    path = vb.CONV_BASE / f"h-{uuid.uuid4().hex[:8]}"
+    path.mkdir()
+    return path
+
+
+def _turn(vb, conv_dir, prompt, status="success"):
+    writer = vb.TurnWriter(conv_dir, prompt, "claude-1")
+    writer.append(json.dumps({"type": "assistant", "prompt": prompt}))
+    writer.close(status, "claude-1")
+
+
+def _prompts(resp):
+    return [t["user_input"] for t in resp.json()["turns"]]
+
+
+def test_failed_turns_hidden_unless_requested(vb, client, conv_dir):
+    _turn(vb, conv_dir, "ok-1")
+    _turn(vb, conv_dir, "bad", status="error_during_execution")
+    _turn(vb, conv_dir, "ok-2")
+    url = f"/chat/history/{conv_dir.name}"
+    assert _prompts(client.get(url)) == ["ok-1", "ok-2"]
+    assert _prompts(client.get(url, params={"n": 2})) == ["ok-1", "ok-2"]
+    assert _prompts(client.get(url, params={"include_failed": True})) == ["ok-1", "bad", "ok-2"]
+
+
+def test_legacy_files_are_imported_on_request(vb, client, conv_dir):
+    legacy = conv_dir / "claude-old.jsonl"
+    legacy.write_text("".join(
+        json.dumps({"chat_id": f"old-{i}", "user_input": f"old-{i}",
+                    "response": [{"type": "assistant", "i": i}]}) + "\n" for i in range(2)))
+    _turn(vb, conv_dir, "new")
+    url = f"/chat/history/{conv_dir.name}"
+
+    assert _prompts(client.get(url)) == ["new"]
+    assert legacy.exists()
+
+    assert client.post("/conversations/migrate").json()["turns"] >= 2
+    assert not legacy.exists()
+    assert (conv_dir / "claude-old.jsonl.migrated").exists()
+    resp = client.get(url)
+    assert _prompts(resp) == ["old-0", "old-1", "new"]
+    assert resp.json()["turns"][1]["response"] == [{"type": "assistant", "i": 1}]
+    row = vb.db().execute("SELECT num_turns FROM projects WHERE stream_id = ?", (conv_dir.name,)).fetchone()
+    assert row["num_turns"] == 3
+    hits = client.get("/chat/search", params={"q": "old", "stream_id": conv_dir.name}).json()["results"]
+    assert sorted(h["chat_id"] for h in hits) == ["old-0", "old-1"]
+
+    # Running it again (or after an interrupted run) does not duplicate turns
+    legacy.write_text((conv_dir / "claude-old.jsonl.migrated").read_text())
+    vb._migrate_legacy_turns(conv_dir)
+    assert _prompts(client.get(url)) == ["old-0", "old-1", "new"]
+
+
+def test_paging_cursors_walk_both_ways(vb, client, conv_dir):
+    for i in range(5):
+        _turn(vb, conv_dir, f"t{i}")
+    url = f"/chat/history/{conv_dir.name}"
+
+    last = client.get(url, params={"n": 2}).json()
+    assert [t["user_input"] for t in last["turns"]] == ["t3", "t4"]
+    older = client.get(url, params={"n": 2, "before": last["before"]}).json()
+    assert [t["user_input"] for t in older["turns"]] == ["t1", "t2"]
+    oldest = client.get(url, params={"n": 2, "before": older["before"]}).json()
+    assert [t["user_input"] for t in oldest["turns"]] == ["t0"]
+    assert oldest["before"] is None
+
+    newer = client.get(url, params={"n": 2, "after": oldest["after"]}).json()
+    assert [t["user_input"] for t in newer["turns"]] == ["t1", "t2"]
+    assert newer["has_newer"] is True
+    summary = client.get(url, params={"after": newer["after"], "summary": True}).json()
+    assert [t["user_input"] for t in summary["turns"]] == ["t3", "t4"]
+    assert "response" not in summary["turns"][0]
+
+
+def test_empty_after_page_echoes_cursor(vb, client, conv_dir):
+    _turn(vb, conv_dir, "only")
+    url = f"/chat/history/{conv_dir.name}"
+    cursor = client.get(url).json()["after"]
+    page = client.get(url, params={"after": cursor}).json()
+    assert page["turns"] == [] and page["after"] == cursor
+
+    _turn(vb, conv_dir, "next")
+    assert _prompts(client.get(url, params={"after": cursor})) == ["next"]
+
+
+def test_n_zero_returns_all_turns(vb, client, conv_dir):
+    for i in range(3):
+        _turn(vb, conv_dir, f"t{i}")
+    url = f"/chat/history/{conv_dir.name}"
+    assert _prompts(client.get(url, params={"n": 0})) == ["t0", "t1", "t2"]
+    assert client.get(url, params={"n": -1}).status_code == 422
+    assert client.get(url, params={"before": "not-a-cursor"}).status_code == 400
+
+
+def test_legacy_files_are_imported_once_at_startup(vb, conv_dir):
+    from fastapi.testclient import TestClient
+
+    (conv_dir / "claude-old.jsonl").write_text(json.dumps(
+        {"chat_id": f"{conv_dir.name}-old", "user_input": "before upgrade", "response": []}) + "\n")
+    vb.db().execute("DELETE FROM migrations WHERE name = 'legacy_conversations'")
+    with TestClient(vb.app) as client:
+        assert _prompts(client.get(f"/chat/history/{conv_dir.name}")) == ["before upgrade"]
+    assert (conv_dir / "claude-old.jsonl.migrated").exists()
+    assert vb.db().execute("SELECT 1 FROM migrations WHERE name = 'legacy_conversations'").fetchone()
@@ -0,0 +1,105 @@
+import asyncio
+import gzip
+import json
+import uuid
+
+import httpx
+import pytest
+
+
+def _chunk(n):
+    return json.dumps({"type": "assistant", "n": n}) + "\n"
+
+
+@pytest.fixture
+def session(vb):
+    sess = vb.Session("stream-user", f"cs-{uuid.uuid4().hex[:8]}")
+    vb.sessions.add(sess)
+    yield sess
+    vb.sessions.discard(sess.stream_id)
+
+
+def _finished_turn(sess, n=3):
+    for i in range(n):
+        sess.channel.publish(_chunk(i))
+    sess.channel.publish_eot()
+
+
+def _lines(text):
+    return [json.loads(line) for line in text.splitlines() if line]
+
+
+def test_plain_stream_tags_every_chunk_with_its_seq(session, client):
+    _finished_turn(session)
+    resp = client.get(f"/chat/stream/{session.stream_id}")
+    assert resp.headers["content-type"].startswith("application/json")
+    assert "content-encoding" not in resp.headers
+    assert _lines(resp.text) == [{"seq": 1, "type": "assistant", "n": 0},
+                                 {"seq": 2, "type": "assistant", "n": 1},
+                                 {"seq": 3, "type": "assistant", "n": 2},
+                                 {"seq": 4, "type": "meta", "event": "eot"}]
+
+
+def test_sse_mode_from_accept_header(session, client):
+    _finished_turn(session, n=1)
+    resp = client.get(f"/chat/stream/{session.stream_id}",
+                      headers={"Accept": "text/event-stream"})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in resp.text.split("\n\n") if e]
+    assert events == [f"id: 1\ndata: {_chunk(0).strip()}",
+                      f'id: 2\ndata: {json.dumps({"type": "meta", "event": "eot"})}']
+
+
+def test_gzip_body_decodes_to_the_plain_stream(session, client):
+    _finished_turn(session)
+    url = f"/chat/stream/{session.stream_id}"
+    plain = client.get(url).content
+    with client.stream("GET", url, params={"compress": True},
+                       headers={"Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["vary"]
+        raw = b"".join(resp.iter_raw())
+    assert raw[:2] == b"\x1f\x8b" and gzip.decompress(raw) == plain
+
+    # Not compressed unless asked for and accepted
+    resp = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers and resp.content == plain
+    resp = client.get(url, params={"compress": True}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resp.headers and resp.content == plain
+
+
+def test_resume_from_last_event_id_or_after(session, client):
+    _finished_turn(session)
+    url = f"/chat/stream/{session.stream_id}"
+    by_header = client.get(url, headers={"Last-Event-ID": "2"})
+    assert [e["seq"] for e in _lines(by_header.text)] == [3, 4]
+    by_query = client.get(url, params={"after": 2}, headers={"Last-Event-ID": "1"})
+    assert by_query.content == by_header.content       # ?after= wins over the header
+
+
+def test_concurrent_listeners_each_get_every_chunk(vb, session):
+    async def scenario():
+        transport = httpx.ASGITransport(app=vb.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            url = f"/chat/stream/{session.stream_id}"
+            listeners = [asyncio.ensure_future(ac.get(url)) for _ in range(2)]
+            while session.channel.listeners < 2:
+                await asyncio.sleep(0.01)
+            _finished_turn(session)
+            return await asyncio.gather(*listeners)
+
+    first, second = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert first.content == second.content
+    assert [e["seq"] for e in _lines(first.text)] == [1, 2, 3, 4]
+
+
+def test_resume_point_lost_from_the_buffer_reports_a_gap(vb, session, client, monkeypatch):
+    monkeypatch.setattr(vb, "STREAM_SPILL_CAP", 0)     # nothing survives outside the ring
+    session.channel.mem_cap = 3 * len(_chunk(0))
+    _finished_turn(session, n=5)
+    events = _lines(client.get(f"/chat/stream/{session.stream_id}",
+                               headers={"Last-Event-ID": "1"}).text)
+    assert events[0] == {"seq": 4, "type": "meta", "event": "gap",
+                         "missed_from": 2, "resume_from": 5}
+    assert [e["seq"] for e in events[1:]] == [5, 6]
+    assert session.channel.dropped == 4
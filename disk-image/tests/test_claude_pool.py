@@ -0,0 +1,89 @@
+import json
+import os
+import signal
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def pool(vb, monkeypatch):
+    monkeypatch.setattr(vb.claude_pool, "size", 4)
+    monkeypatch.setattr(vb.claude_pool, "max_turns", 2)
+    monkeypatch.setattr(vb.scheduler, "max_running", 4)
+    monkeypatch.setattr(vb.scheduler, "max_per_user", 4)
+    for name in ("hits", "misses", "recycled", "reclaimed"):
+        monkeypatch.setattr(vb.claude_pool, name, 0)
+    # Leaving the lifespan stops and reaps the idle workers
+    with TestClient(vb.app) as client:
+        yield vb.claude_pool, client
+    assert not vb.claude_pool.idle
+
+
+def _turn(client, user_id, prompt, stream_id=None):
+    """Run one turn (background tasks finish before TestClient returns); pid that answered."""
+    body = {"user_id": user_id, "prompt": prompt, "stream_id": stream_id}
+    sid = client.post("/chat/start", json=body).json()["stream_id"]
+    turns = client.get(f"/chat/history/{sid}", params={"n": 1}).json()["turns"]
+    assert turns[-1]["user_input"] == prompt
+    return sid, turns[-1]["response"][0]["pid"]
+
+
+def _wait_dead(pid):
+    deadline = time.monotonic() + 5
+    while os.path.exists(f"/proc/{pid}") and open(f"/proc/{pid}/stat").read().split()[2] != "Z":
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_warm_reuse_recycling_and_crash_replacement(pool):
+    pool, client = pool
+    sid, cold = _turn(client, "u1", "one")
+    assert pool.misses == 1 and sid in pool.idle
+
+    _, warm1 = _turn(client, "u1", "two", sid)
+    _, warm2 = _turn(client, "u1", "three", sid)
+    assert warm1 == warm2 != cold
+    assert (pool.hits, pool.recycled) == (2, 1)        # retired after max_turns
+
+    replacement = pool.idle[sid]
+    assert replacement.proc.pid != warm1
+    os.kill(replacement.proc.pid, signal.SIGKILL)
+    _wait_dead(replacement.proc.pid)
+    time.sleep(0.1)                                     # let the loop reap it
+
+    _, after_crash = _turn(client, "u1", "four", sid)
+    assert after_crash != replacement.proc.pid
+    assert pool.misses == 2
+    assert pool.idle[sid].alive
+
+
+def test_idle_workers_count_against_caps(pool, vb, monkeypatch):
+    pool, client = pool
+    monkeypatch.setattr(vb.scheduler, "max_running", 1)
+    monkeypatch.setattr(vb.scheduler, "max_per_user", 1)
+    sid_a, _ = _turn(client, "u1", "a")
+    assert list(pool.idle) == [sid_a]
+
+    # Admitting another session's turn stops the idle worker to stay within max_running
+    sid_b, _ = _turn(client, "u2", "b")
+    assert pool.reclaimed == 1
+    assert list(pool.idle) == [sid_b]
+    assert vb.scheduler.total_running == 0
+
+
+def test_failed_spawn_closes_turn_and_sends_eot(vb, client, monkeypatch):
+    monkeypatch.setattr(vb, "CLAUDE_BIN", "/nonexistent/claude")
+    sid = client.post("/chat/start", json={"user_id": "u1", "prompt": "boom"}).json()["stream_id"]
+
+    # The stream ends instead of waiting forever for a turn that never started
+    lines = client.get(f"/chat/stream/{sid}").text.splitlines()
+    events = [json.loads(line)["event"] for line in lines if line]
+    assert events == ["error", "eot"]
+
+    url = f"/chat/history/{sid}"
+    assert client.get(url).status_code == 404            # no successful turns
+    turns = client.get(url, params={"include_failed": True, "summary": True}).json()["turns"]
+    assert [(t["user_input"], t["status"]) for t in turns] == [("boom", "error")]
+    assert sid not in vb.claude_pool.idle
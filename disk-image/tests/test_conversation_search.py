@@ -0,0 +1,27 @@
+import uuid
+
+
+def test_snippets_are_escaped_with_highlighted_hits(vb, client):
+    sid = f"s-{uuid.uuid4().hex[:8]}"
+    vb.conversation_search.add(f"{sid}-1", sid, "search-user",
+                               "render <script>alert(1)</script> marker", "ok & done")
+    results = client.get("/chat/search", params={"q": "marker", "stream_id": sid}).json()["results"]
+    assert len(results) == 1
+    assert results[0]["user_input"] == "render &lt;script&gt;alert(1)&lt;/script&gt; <b>marker</b>"
+    assert results[0]["assistant"] == "ok &amp; done"
+
+
+def test_rebuild_indexes_legacy_jsonl(vb, client):
+    import json
+
+    sid = f"s-{uuid.uuid4().hex[:8]}"
+    conv_dir = vb.CONV_BASE / sid
+    conv_dir.mkdir()
+    (conv_dir / "claude-old.jsonl").write_text(json.dumps({
+        "chat_id": f"{sid}-1", "user_input": "legacy zebra prompt",
+        "response": [{"type": "assistant", "message": {"content": [{"type": "text", "text": "stripes"}]}}],
+    }) + "\n")
+    vb.conversation_search.rebuild()
+    results = client.get("/chat/search", params={"q": "zebra", "stream_id": sid}).json()["results"]
+    assert [r["chat_id"] for r in results] == [f"{sid}-1"]
+    assert results[0]["assistant"] == "stripes"
@@ -0,0 +1,55 @@
+import json
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def conv_dir(vb):
+    path = vb.CONV_BASE / f"c-{uuid.uuid4().hex[:8]}"
+    path.mkdir()
+    return path
+
+
+def _turn(vb, conv_dir, prompt, events, status="success"):
+    writer = vb.TurnWriter(conv_dir, prompt, "claude-1")
+    for event in events:
+        writer.append(json.dumps(event))
+    writer.close(status, "claude-1")
+    return writer.chat_id
+
+
+def test_closed_turn_is_packed(vb, conv_dir, monkeypatch):
+    monkeypatch.setattr(vb, "CONV_COMPRESS", True)
+    big = "x" * (vb.CONV_BLOB_MIN + 10)
+    chat_id = _turn(vb, conv_dir, "hello", [{"type": "assistant", "text": big}, {"type": "result"}])
+    entries = vb.read_turn_index(conv_dir)
+    assert [e["chat_id"] for e in entries] == [chat_id]
+    assert entries[0]["pack"]
+    assert (conv_dir / vb.TURN_SEGMENT).stat().st_size == 0
+    turn = vb.load_turn(conv_dir, entries[0])
+    assert turn["response"] == [{"type": "assistant", "text": big}, {"type": "result"}]
+
+
+def test_compaction_packs_raw_turns_without_loading_sessions(vb, conv_dir, monkeypatch):
+    monkeypatch.setattr(vb, "CONV_COMPRESS", False)
+    ids = [_turn(vb, conv_dir, f"p{i}", [{"type": "assistant", "n": i}]) for i in range(3)]
+    monkeypatch.setattr(vb, "CONV_COMPRESS", True)
+    (vb.SESSION_STORE / f"{conv_dir.name}.json").write_text(
+        json.dumps({"user_id": "u", "stream_id": conv_dir.name}))
+
+    with TestClient(vb.app) as client:
+        client.post("/conversations/compact")
+        deadline = time.monotonic() + 10
+        while client.get("/conversations/compact").json()["running"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+    assert conv_dir.name not in vb.sessions.resident
+    entries = vb.read_turn_index(conv_dir)
+    assert [e["chat_id"] for e in entries] == ids
+    assert all(e["pack"] for e in entries)
+    assert [vb.load_turn(conv_dir, e)["response"] for e in entries] == [
+        [{"type": "assistant", "n": i}] for i in range(3)]
@@ -0,0 +1,38 @@
+import asyncio
+import json
+import uuid
+
+
+def _project(vb):
+    sid = f"d-{uuid.uuid4().hex[:8]}"
+    (vb.CONV_BASE / sid).mkdir()
+    (vb.CONV_BASE / sid / "meta.json").write_text(json.dumps({"project_name": "doomed"}))
+    (vb.RUNS_BASE / sid).mkdir()
+    vb.project_catalog.add(sid, "del-user", "doomed")
+    return sid
+
+
+def test_delete_removes_files_rows_and_loop_state(vb, client):
+    sid = _project(vb)
+    vb.run_log(sid, "dev.log")
+    assert client.delete(f"/projects/{sid}").json()["deleted"] == sid
+    assert not (vb.CONV_BASE / sid).exists() and not (vb.RUNS_BASE / sid).exists()
+    assert not any(p.parent.name == sid for p in vb._run_logs)
+    assert not vb.db().execute("SELECT 1 FROM projects WHERE stream_id = ?", (sid,)).fetchone()
+    assert client.delete(f"/projects/{sid}").status_code == 404
+
+
+def test_delete_refused_while_turn_runs(vb, client):
+    sid = _project(vb)
+    lock = vb.turn_lock(sid)
+
+    async def hold():
+        await lock.acquire()
+
+    asyncio.run(hold())                     # a turn is in progress
+    try:
+        assert client.delete(f"/projects/{sid}").status_code == 409
+        assert (vb.RUNS_BASE / sid).exists()
+    finally:
+        lock.release()
+    assert client.delete(f"/projects/{sid}").status_code == 200
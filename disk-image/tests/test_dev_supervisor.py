@@ -0,0 +1,71 @@
+import asyncio
+import json
+import socket
+import time
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def fast(vb, monkeypatch):
+    monkeypatch.setattr(vb, "DEV_BACKOFF_MAX", 0.05)
+    monkeypatch.setattr(vb, "DEV_MAX_RESTARTS", 2)
+    monkeypatch.setattr(vb, "DEV_STOP_GRACE", 1.0)
+    return vb.DevSupervisor()
+
+
+def _project(vb, script):
+    sid = f"dev-{uuid.uuid4().hex[:8]}"
+    run_path = vb.RUNS_BASE / sid
+    run_path.mkdir()
+    (run_path / "package.json").write_text(json.dumps({"scripts": {"dev": script}}))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return sid, port, run_path
+
+
+async def _until(check, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.02)
+
+
+def test_crash_loop_backs_off_then_gives_up(vb, fast):
+    sid, port, run_path = _project(vb, "exit 3")
+
+    async def scenario():
+        server = await fast.start(sid, "dev", port, run_path)
+        await _until(lambda: server.state == "failed")
+        return server
+
+    server = asyncio.run(scenario())
+    assert server.exit_code == 3
+    assert server.restarts == vb.DEV_MAX_RESTARTS
+    assert server.stop_reason == "exited 3 times in a row"
+
+
+def test_restarts_after_crash_and_stops_process_group(vb, fast):
+    # Crashes on the first run only, then keeps running until stopped
+    sid, port, run_path = _project(vb, "test -f ran && exec sleep 30; touch ran; exit 1")
+
+    async def scenario():
+        server = await fast.start(sid, "dev", port, run_path)
+        await _until(lambda: server.restarts == 1 and server.state == "starting")
+        proc = server.proc
+        await fast.stop(sid)
+        return server, proc
+
+    server, proc = asyncio.run(scenario())
+    assert server.state == "stopped" and server.stop_reason == "stopped"
+    assert server.exit_code == 1                        # the crash, not the stop
+    assert proc.returncode is not None
+
+
+def test_no_memory_cap_unless_configured(vb, monkeypatch):
+    assert "prlimit" not in vb._dev_command("dev")
+    monkeypatch.setattr(vb, "DEV_MEM_MB", 512)
+    monkeypatch.setattr(vb.shutil, "which", lambda name: f"/usr/bin/{name}")
+    assert vb._dev_command("dev")[:2] == ["prlimit", f"--data={512 << 20}:{512 << 20}"]
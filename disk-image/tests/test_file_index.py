@@ -0,0 +1,48 @@
+import os
+
+import fs_index
+
+
+def _tree(root, *paths):
+    for p in paths:
+        target = root / p
+        if p.endswith("/"):
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(p)
+
+
+def test_refresh_picks_up_creates_deletes_and_renames(tmp_path):
+    _tree(tmp_path, "src/app.py", "src/lib/util.py", "docs/readme.md", "node_modules/x/index.js")
+    index = fs_index.FileIndex(str(tmp_path))
+    index.ensure()
+    assert index.paths == ["docs", "docs/readme.md", "src", "src/app.py", "src/lib", "src/lib/util.py"]
+
+    (tmp_path / "docs/readme.md").unlink()
+    _tree(tmp_path, "src/lib/new/deep.py")
+    os.rename(tmp_path / "src", tmp_path / "code")
+    index.ensure(max_age=0)
+    assert index.paths == ["code", "code/app.py", "code/lib", "code/lib/new", "code/lib/new/deep.py",
+                           "code/lib/util.py", "docs"]
+    assert index.changes > 0
+
+    # Nothing moved: a refresh re-reads no directory and changes nothing
+    before = index.changes
+    index.ensure(max_age=0)
+    assert index.changes == before
+
+
+def test_search_uses_index_below_root(fsapi, fs_client, tmp_path):
+    _tree(tmp_path, "a/main.py", "a/b/main.py", "c/other.py")
+    found = fs_client.get("/search", params={"pattern": "main.py", "path": str(tmp_path)}).json()
+    rel = str(tmp_path).lstrip("/")
+    assert found == [f"{rel}/a/b/main.py", f"{rel}/a/main.py"]
+
+    # A sub-path search reuses the root's index and, once re-validated, sees later changes
+    _tree(tmp_path, "a/b/c/main.py")
+    index, sub = fsapi.file_indexes.for_path(str(tmp_path / "a" / "b"))
+    assert index.root == str(tmp_path) and sub == "a/b"
+    index.ensure(max_age=0)
+    found = fs_client.get("/search", params={"pattern": "*.py", "path": str(tmp_path / "a" / "b")}).json()
+    assert found == [f"{rel}/a/b/c/main.py", f"{rel}/a/b/main.py"]
@@ -0,0 +1,62 @@
+import pytest
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for d in ("b-dir", "A-dir", "b-dir/inner"):
+        (tmp_path / d).mkdir()
+    for f in ("z.txt", "a.txt", "B.txt", "b-dir/one.txt", "b-dir/inner/deep.txt", "A-dir/two.txt"):
+        (tmp_path / f).write_text(f)
+    return tmp_path
+
+
+def _pages(fs_client, **params):
+    pages, cursor = [], None
+    while True:
+        body = fs_client.get("/list", params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        pages.append(body["entries"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_plain_listing_puts_directories_first(fs_client, tree):
+    names = [e["name"] for e in fs_client.get("/list", params={"path": str(tree)}).json()]
+    assert names == ["A-dir", "b-dir", "a.txt", "B.txt", "z.txt"]
+
+
+def test_cursor_pages_cover_listing_once(fs_client, tree):
+    full = fs_client.get("/list", params={"path": str(tree), "depth": 3}).json()
+    pages = _pages(fs_client, path=str(tree), depth=3, limit=2)
+    assert all(len(p) <= 2 for p in pages)
+    assert [e for p in pages for e in p] == full
+    assert [e["path"].rsplit("/", 1)[-1] for e in full][:4] == ["A-dir", "two.txt", "b-dir", "inner"]
+
+
+def test_cursor_survives_changes_between_pages(fs_client, tree):
+    first = fs_client.get("/list", params={"path": str(tree), "limit": 2, "fields": "name"}).json()
+    assert first["entries"] == [{"name": "A-dir"}, {"name": "b-dir"}]
+    (tree / "a.txt").unlink()
+    (tree / "0-new.txt").write_text("")
+    rest = fs_client.get("/list", params={"path": str(tree), "cursor": first["next_cursor"],
+                                          "fields": "name"}).json()
+    assert rest == {"entries": [{"name": "0-new.txt"}, {"name": "B.txt"}, {"name": "z.txt"}],
+                    "next_cursor": None}
+
+
+def test_bad_cursor_and_fields_rejected(fs_client, tree):
+    assert fs_client.get("/list", params={"path": str(tree), "cursor": "nope"}).status_code == 400
+    assert fs_client.get("/list", params={"path": str(tree), "fields": "name,owner"}).status_code == 400
+
+
+def test_gateway_lists_below_runs_with_the_same_paging(vb, client):
+    project = vb.RUNS_BASE / "list-shared"
+    (project / "src").mkdir(parents=True, exist_ok=True)
+    (project / "src" / "app.js").write_text("x")
+    (project / "package.json").write_text("{}")
+    params = {"path": "list-shared", "depth": 2, "fields": "path", "limit": 2}
+    first = client.get("/list", params=params).json()
+    assert first["entries"] == [{"path": "list-shared/src"}, {"path": "list-shared/src/app.js"}]
+    rest = client.get("/list", params={**params, "cursor": first["next_cursor"]}).json()
+    assert rest == {"entries": [{"path": "list-shared/package.json"}], "next_cursor": None}
+    assert client.get("/list", params={**params, "cursor": "nope"}).status_code == 400
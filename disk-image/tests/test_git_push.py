@@ -0,0 +1,93 @@
+import subprocess
+
+import pytest
+
+
+def _git(*args, cwd=None):
+    return subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                          cwd=cwd, check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
+
+
+@pytest.fixture
+def remote(tmp_path):
+    path = tmp_path / "remote.git"
+    _git("init", "-q", "--bare", "-b", "main", str(path))
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    work = tmp_path / "work"
+    work.mkdir()
+    (work / "index.js").write_text("v1\n")
+    (work / "node_modules").mkdir()
+    (work / "node_modules" / "dep.js").write_text("ignored\n")
+    return work, tmp_path / "mirror.git"
+
+
+def _log(remote):
+    return _git("--git-dir", str(remote), "log", "--format=%s", "main").splitlines()
+
+
+def _files(remote):
+    return _git("--git-dir", str(remote), "ls-tree", "-r", "--name-only", "main").splitlines()
+
+
+def test_mirror_is_reused_and_only_changes_are_pushed(vb, project, remote):
+    work, mirror = project
+    vb.git_push(work, mirror, str(remote))          # empty remote: nothing to fetch
+    assert _files(remote) == ["index.js"]           # default excludes apply
+    assert not (work / ".git").exists()
+
+    vb.git_push(work, mirror, str(remote))          # no changes: no commit, no push
+    assert _log(remote) == ["Session update"]
+
+    first = _git("--git-dir", str(mirror), "rev-parse", "HEAD")
+    (work / "index.js").write_text("v2\n")
+    vb.git_push(work, mirror, str(remote))
+    assert _log(remote) == ["Session update", "Session update"]
+    assert _git("--git-dir", str(remote), "rev-parse", "main~1") == first   # fast-forward
+
+
+def test_fresh_mirror_continues_existing_remote_history(vb, project, remote, tmp_path):
+    clone = tmp_path / "clone"
+    _git("clone", "-q", str(remote), str(clone))
+    (clone / "README.md").write_text("hello\n")
+    _git("add", "-A", cwd=clone)
+    _git("commit", "-qm", "initial", cwd=clone)
+    _git("push", "-q", "origin", "HEAD:main", cwd=clone)
+
+    work, mirror = project
+    vb.git_push(work, mirror, str(remote))
+    assert _log(remote) == ["Session update", "initial"]
+    # Files only on the remote are dropped by the work tree's commit, not force-pushed away
+    assert _files(remote) == ["index.js"]
+
+
+def test_rejected_push_is_rebased_on_the_remote_and_retried(vb, project, remote, tmp_path):
+    work, mirror = project
+    vb.git_push(work, mirror, str(remote))
+
+    clone = tmp_path / "clone"
+    _git("clone", "-q", str(remote), str(clone))
+    (clone / "other.txt").write_text("from elsewhere\n")
+    _git("add", "-A", cwd=clone)
+    _git("commit", "-qm", "elsewhere", cwd=clone)
+    _git("push", "-q", "origin", "HEAD:main", cwd=clone)
+
+    (work / "index.js").write_text("v2\n")
+    vb.git_push(work, mirror, str(remote))
+    assert _log(remote) == ["Session update", "elsewhere", "Session update"]
+
+
+def test_push_failure_raises(vb, project, tmp_path):
+    work, mirror = project
+    missing = tmp_path / "missing.git"
+    with pytest.raises(subprocess.CalledProcessError):
+        vb.git_push(work, mirror, str(missing))
+    assert (mirror / "HEAD").exists()               # the mirror and its commit are kept
+
+    # The next attempt reuses the mirror and goes through once the remote exists
+    _git("init", "-q", "--bare", "-b", "main", str(missing))
+    vb.git_push(work, mirror, str(missing))
+    assert _files(missing) == ["index.js"]
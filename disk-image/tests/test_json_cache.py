@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def cache(vb):
+    return vb.JsonFileCache(max_entries=2)
+
+
+def test_reread_only_when_mtime_or_size_changes(cache, tmp_path):
+    path = tmp_path / "meta.json"
+    path.write_text(json.dumps({"v": 1}))
+    assert cache.read(path) == {"v": 1}
+    assert cache.read(path) == {"v": 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Same size, new mtime
+    st = path.stat()
+    path.write_text(json.dumps({"v": 2}))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.read(path) == {"v": 2}
+
+    # Same mtime, new size
+    st = path.stat()
+    path.write_text(json.dumps({"v": 30}))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.read(path) == {"v": 30}
+    assert cache.misses == 3
+
+
+def test_copies_are_handed_out(cache, tmp_path):
+    path = tmp_path / "meta.json"
+    cache.write(path, {"v": 1})
+    cache.read(path)["v"] = 99
+    assert cache.read(path) == {"v": 1}
+    assert (cache.hits, cache.misses, cache.writes) == (2, 0, 1)
+
+
+def test_least_recently_used_entries_are_evicted(cache, tmp_path):
+    paths = [tmp_path / f"{name}.json" for name in "abc"]
+    for i, path in enumerate(paths):
+        path.write_text(json.dumps(i))
+    cache.read(paths[0])
+    cache.read(paths[1])
+    cache.read(paths[0])                        # a is now the most recent
+    cache.read(paths[2])                        # evicts b
+    assert (cache.stats()["entries"], cache.evictions) == (2, 1)
+    cache.read(paths[0])
+    cache.read(paths[1])
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_forget_drops_a_project(cache, tmp_path):
+    project = tmp_path / "p1"
+    project.mkdir()
+    cache.write(project / "meta.json", {"v": 1})
+    cache.write(tmp_path / "env.json", {"v": 2})
+    cache.forget(project)
+    assert cache.stats()["entries"] == 1
+
+
+def test_missing_and_corrupt_files(cache, tmp_path):
+    path = tmp_path / "meta.json"
+    assert cache.read(path, {}) == {}
+    cache.write(path, {"v": 1})
+    path.unlink()
+    assert cache.read(path) is None
+    assert cache.stats()["entries"] == 0        # a vanished file is dropped
+
+    path.write_text("{not json")
+    with pytest.raises(json.JSONDecodeError):
+        cache.read(path)
+    assert cache.stats()["entries"] == 0        # nothing cached for a corrupt file
+    path.write_text(json.dumps({"v": 2}))
+    assert cache.read(path) == {"v": 2}
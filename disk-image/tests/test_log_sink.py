@@ -0,0 +1,48 @@
+import json
+import threading
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_concurrent_flushes_keep_queue_order(vb, tmp_path):
+    sink = vb.LogSink(tmp_path / "process.log", capacity=100_000)
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.is_set():
+            sink.flush()
+
+    threads = [threading.Thread(target=flusher) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(5000):
+        sink.emit("order", "test", str(i))
+    stop.set()
+    for t in threads:
+        t.join()
+    sink.flush()
+    assert [r["line"] for r in _records(sink.path)] == [str(i) for i in range(5000)]
+
+
+def test_zero_backups_keeps_no_rotated_file(vb, tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "LOG_SINK_BACKUPS", 0)
+    monkeypatch.setattr(vb, "LOG_SINK_MAX_BYTES", 200)
+    sink = vb.LogSink(tmp_path / "process.log")
+    for i in range(10):
+        sink.emit("rot", "test", f"line {i}")
+        sink.flush()
+    assert sink.rotations > 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["process.log"]
+    assert [r["line"] for r in sink.query("rot")][-1] == "line 9"
+
+
+def test_rotation_keeps_configured_backups(vb, tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "LOG_SINK_BACKUPS", 2)
+    monkeypatch.setattr(vb, "LOG_SINK_MAX_BYTES", 200)
+    sink = vb.LogSink(tmp_path / "process.log")
+    for i in range(20):
+        sink.emit("rot", "test", f"line {i}")
+        sink.flush()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["process.log", "process.log.1", "process.log.2"]
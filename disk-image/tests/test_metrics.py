@@ -0,0 +1,44 @@
+import json
+import uuid
+
+
+def _samples(text, name):
+    """{label string: value} for every sample of `name` in an exposition."""
+    out = {}
+    for line in text.splitlines():
+        if line.startswith(name + "{") or line.startswith(name + " "):
+            labels, _, value = line[len(name):].rpartition(" ")
+            out[labels] = float(value)
+    return out
+
+
+def test_latency_is_labelled_by_route_template(client):
+    missing = [f"lat-{uuid.uuid4().hex[:8]}" for _ in range(2)]
+    for sid in missing:
+        assert client.get(f"/chat/history/{sid}").status_code == 404
+    assert client.get(f"/no/such/{missing[0]}").status_code == 404
+
+    text = client.get("/metrics").text
+    counts = _samples(text, "vibe_http_request_seconds_count")
+    assert counts['{method="GET",route="/chat/history/{stream_id}",status="404"}'] >= 2
+    assert counts['{method="GET",route="unmatched",status="404"}'] >= 1
+    assert not any(sid in labels for labels in counts for sid in missing)
+
+
+def test_gauges_are_evaluated_at_scrape(vb, client):
+    sess = vb.Session("metrics-user", f"m-{uuid.uuid4().hex[:8]}")
+    vb.sessions.add(sess)
+    try:
+        sess.channel.publish(json.dumps({"type": "assistant"}) + "\n")
+        resp = client.get("/metrics")
+    finally:
+        vb.sessions.discard(sess.stream_id)
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert "# TYPE vibe_claude_running gauge" in text
+    assert _samples(text, "vibe_claude_running") == {"": 0.0}
+    assert _samples(text, "vibe_stream_listeners")[f'{{stream_id="{sess.stream_id}"}}'] == 0
+    buffered = _samples(text, "vibe_stream_buffered_bytes")
+    assert buffered[f'{{stream_id="{sess.stream_id}",where="memory"}}'] == len(
+        json.dumps({"type": "assistant"}) + "\n")
+    assert f'stream_id="{sess.stream_id}"' not in client.get("/metrics").text   # gone with the session
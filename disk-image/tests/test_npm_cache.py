@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import uuid
+
+import pytest
+
+
+def _project(vb, deps):
+    run_path = vb.RUNS_BASE / f"n-{uuid.uuid4().hex[:8]}"
+    run_path.mkdir()
+    (run_path / "package.json").write_text(json.dumps(
+        {"name": run_path.name, "scripts": {"dev": "vite"}, "dependencies": deps}))
+    return run_path
+
+
+def _install(vb, run_path):
+    async def scenario():
+        job = vb.install_jobs.ensure(run_path.name, run_path)
+        ok = await job.wait()
+        while vb.npm_cache._tasks:
+            await asyncio.sleep(0.01)
+        return ok, job.source
+    return asyncio.run(asyncio.wait_for(scenario(), 10))
+
+
+@pytest.fixture
+def deps():
+    tag = uuid.uuid4().hex[:6]          # unique cache key per test
+    return {f"left-pad-{tag}": "^1.0.0", f"native-addon-{tag}": "^2.0.0"}
+
+
+def test_miss_installs_and_publishes_then_hit_restores(vb, deps):
+    first = _project(vb, deps)
+    assert _install(vb, first) == (True, "npm")
+    key = vb.npm_cache.key(first)
+    assert (vb.NPM_CACHE_BASE / key / "node_modules").is_dir()
+
+    second = _project(vb, deps)
+    assert _install(vb, second) == (True, "cache")
+    assert "restored from cache" in (second / "install.log").read_text()
+
+
+def test_shared_files_are_read_only_and_scripted_packages_copied(vb, deps):
+    first = _project(vb, deps)
+    _install(vb, first)
+    second = _project(vb, deps)
+    _install(vb, second)
+    plain, native = list(deps)
+
+    shared = second / "node_modules" / plain / "index.js"
+    stored = vb.NPM_CACHE_BASE / vb.npm_cache.key(first) / "node_modules" / plain / "index.js"
+    assert os.stat(shared).st_ino == os.stat(stored).st_ino
+    assert not os.stat(shared).st_mode & 0o222
+
+    own = second / "node_modules" / native / "index.js"
+    assert os.stat(own).st_ino != os.stat(first / "node_modules" / native / "index.js").st_ino
+    assert os.stat(own).st_mode & 0o200
+
+
+def test_failed_install_is_not_published(vb, deps, monkeypatch):
+    monkeypatch.setenv("STUB_NPM_RC", "1")
+    run_path = _project(vb, deps)
+    assert _install(vb, run_path) == (False, "npm")
+    assert not (vb.NPM_CACHE_BASE / vb.npm_cache.key(run_path)).exists()
+
+
+def test_publish_failure_is_logged(vb, monkeypatch, capsys):
+    def boom(key, run_path):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(vb.npm_cache, "publish", boom)
+
+    async def scenario():
+        vb.npm_cache.publish_later("k", vb.RUNS_BASE)
+        while vb.npm_cache._tasks:
+            await asyncio.sleep(0.01)
+    asyncio.run(scenario())
+    assert "publish failed: RuntimeError('disk full')" in capsys.readouterr().err
+
+
+def test_ensure_is_single_flight_and_keeps_its_task(vb, deps):
+    run_path = _project(vb, deps)
+
+    async def scenario():
+        job = vb.install_jobs.ensure(run_path.name, run_path)
+        assert vb.install_jobs.ensure(run_path.name, run_path) is job
+        assert job.task is not None and not job.task.done()
+        await job.task
+        while vb.npm_cache._tasks:
+            await asyncio.sleep(0.01)
+        return job.state
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 10)) == "succeeded"
@@ -0,0 +1,28 @@
+import socket
+import uuid
+
+
+def test_socket_pids_finds_listener(vb):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        port = sock.getsockname()[1]
+        assert vb.os.getpid() in vb.port_manager.owners(port, fresh=True)
+
+
+def test_assign_scans_sockets_before_taking_write_lock(vb, monkeypatch):
+    scans = []
+    real = vb.port_manager.listeners
+
+    def listeners(fresh=False):
+        scans.append(vb.db().in_transaction)
+        return real(fresh)
+
+    monkeypatch.setattr(vb.port_manager, "listeners", listeners)
+    sid = f"port-{uuid.uuid4().hex[:8]}"
+    try:
+        port = vb.port_manager.assign(sid)
+        assert vb.port_manager.lease_of(sid) == port
+        assert scans == [False]
+    finally:
+        vb.port_manager.release(sid)
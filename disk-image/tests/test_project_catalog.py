@@ -0,0 +1,38 @@
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+
+def test_catalog_is_backfilled_at_startup_not_import(vb):
+    sid = f"p-{uuid.uuid4().hex[:8]}"
+    conv_dir = vb.CONV_BASE / sid
+    conv_dir.mkdir()
+    (conv_dir / "meta.json").write_text(json.dumps({"project_name": "backfilled"}))
+    writer = vb.TurnWriter(conv_dir, "hi", None)
+    writer.close("success", None, 0.5)
+    vb.db().execute("DELETE FROM migrations WHERE name = 'project_catalog'")
+
+    with TestClient(vb.app) as client:
+        projects = client.get("/projects", params={"q": "backfilled"}).json()["projects"]
+    assert [(p["stream_id"], p["num_turns"], p["cost_usd"]) for p in projects] == [(sid, 1, 0.5)]
+
+
+def test_chat_start_and_turn_update_catalog(vb, client):
+    sid = client.post("/chat/start", json={"user_id": "cat-user", "prompt": "hello"}).json()["stream_id"]
+    projects = client.get("/projects", params={"user_id": "cat-user"}).json()["projects"]
+    assert [(p["stream_id"], p["num_turns"]) for p in projects] == [(sid, 1)]
+    assert projects[0]["cost_usd"] > 0
+
+
+def test_rebuild_counts_legacy_turns(vb):
+    sid = f"p-{uuid.uuid4().hex[:8]}"
+    conv_dir = vb.CONV_BASE / sid
+    conv_dir.mkdir()
+    legacy = conv_dir / "claude-old.jsonl"
+    legacy.write_text("".join(json.dumps({"chat_id": f"{sid}-{i}", "user_input": f"q{i}",
+                                          "response": []}) + "\n" for i in range(3)))
+    vb.project_catalog.rebuild()
+    row = vb.db().execute("SELECT num_turns, last_modified FROM projects WHERE stream_id = ?",
+                          (sid,)).fetchone()
+    assert (row["num_turns"], row["last_modified"]) == (3, legacy.stat().st_mtime)
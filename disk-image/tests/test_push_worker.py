@@ -0,0 +1,40 @@
+import asyncio
+import uuid
+
+
+def test_worker_keeps_no_session_and_hands_repo_back_to_loop(vb, monkeypatch):
+    monkeypatch.setattr(vb, "PUSH_DEBOUNCE", 0.01)
+    calls = []
+
+    def fake_push(stream_id, repo_name, repo_url):
+        calls.append((stream_id, repo_name, repo_url))
+        return repo_name or "repo-1", repo_url or "https://example.invalid/repo-1.git"
+
+    monkeypatch.setattr(vb, "push_runs_to_github", fake_push)
+    sid = f"push-{uuid.uuid4().hex[:8]}"
+    session = vb.Session("push-user", sid)
+    vb.sessions.add(session)
+
+    async def wait_state(state):
+        while (vb.push_worker.snapshot(sid) or {}).get("state") != state:
+            await asyncio.sleep(0.005)
+
+    async def scenario():
+        vb.push_worker.request(session)
+        await wait_state("ok")
+        await asyncio.sleep(0.01)               # let _adopt_repo run on the loop
+        assert (session.repo_name, session.repo_url) == ("repo-1", "https://example.invalid/repo-1.git")
+        assert sid not in vb.push_worker._repos and sid not in vb.push_worker._created
+
+        vb.push_worker.request(session)
+        while len(calls) < 2:
+            await asyncio.sleep(0.005)
+        await wait_state("ok")
+
+    try:
+        asyncio.run(asyncio.wait_for(scenario(), 5))
+    finally:
+        vb.sessions.discard(sid)
+        vb.push_worker.forget(sid)
+    assert calls == [(sid, None, None), (sid, "repo-1", "https://example.invalid/repo-1.git")]
+    assert vb.load_session(sid).repo_name == "repo-1"
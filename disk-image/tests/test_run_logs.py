@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def log_path(vb):
+    run_dir = vb.RUNS_BASE / f"l-{uuid.uuid4().hex[:8]}"
+    run_dir.mkdir()
+    return run_dir / "dev.log"
+
+
+def test_read_new_returns_complete_lines(vb, log_path):
+    log_path.write_bytes(b"one\ntwo\nthr")
+    data, pos, ino, held = vb._read_new(log_path, 0, None)
+    assert (data, pos, held) == (b"one\ntwo\n", 8, True)
+    data, pos, ino, held = vb._read_new(log_path, pos, ino, partial=True)
+    assert (data, pos, held) == (b"thr", 11, False)
+
+
+def test_read_new_emits_overlong_line(vb, log_path, monkeypatch):
+    monkeypatch.setattr(vb, "LOG_FOLLOW_READ", 16)
+    log_path.write_bytes(b"x" * 40 + b"\n")
+    pos, ino, chunks = 0, None, []
+    for _ in range(4):
+        data, pos, ino, _ = vb._read_new(log_path, pos, ino)
+        chunks.append(data)
+    assert b"".join(chunks) == b"x" * 40 + b"\n"
+
+
+def test_read_new_restarts_after_truncation(vb, log_path):
+    log_path.write_bytes(b"a long first line\n")
+    _, pos, ino, _ = vb._read_new(log_path, 0, None)
+    log_path.write_bytes(b"new\n")
+    assert vb._read_new(log_path, pos, ino)[:2] == (b"new\n", 4)
+
+
+def test_follow_unknown_session_is_404(vb, client):
+    sid = f"missing-{uuid.uuid4().hex[:8]}"
+    assert client.get(f"/session/logs/{sid}/follow").status_code == 404
+    assert not any(p.parent.name == sid for p in vb._run_logs)
+
+
+def test_earlier_log_is_classified_once_across_threads(vb, log_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    log_path.write_text("ok\nnpm ERR! missing script\n" * 5000)
+    log = vb.RunLog(log_path)
+    with ThreadPoolExecutor(8) as pool:
+        summaries = list(pool.map(lambda _: log.summary(), range(8)))
+    assert {s["lines"] for s in summaries} == {10000}
+
+
+def test_get_logs_reads_off_loop_and_registers_on_it(vb, client, log_path, monkeypatch):
+    import asyncio
+
+    log_path.write_text("ready\nnpm ERR! missing script\n")
+    sid = log_path.parent.name
+    real = vb.run_log
+
+    def on_loop_only(*args):
+        asyncio.get_running_loop()          # raises in a threadpool worker
+        return real(*args)
+
+    monkeypatch.setattr(vb, "run_log", on_loop_only)
+    body = client.get(f"/session/logs/{sid}").json()
+    assert body["runtime"] == "ready\nnpm ERR! missing script\n" and body["install"] == ""
+    assert body["errors"]["runtime"]["errors"] == 1 and not body["success"]
+    assert {p.name for p in vb._run_logs if p.parent.name == sid} == {"install.log", "dev.log"}
+
+    missing = f"missing-{uuid.uuid4().hex[:8]}"
+    assert client.get(f"/session/logs/{missing}").status_code == 404
+    assert not any(p.parent.name == missing for p in vb._run_logs)
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from contextlib import aclosing
+
+import pytest
+
+EOT = json.dumps({"type": "meta", "event": "eot"}) + "\n"
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def _chunk(n):
+    return json.dumps({"type": "assistant", "n": n}) + "\n"
+
+
+def test_queued_turn_listener_skips_running_turn(vb, tmp_path):
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool")
+        ch.begin_turn()
+        ch.publish(_chunk(1))
+        ch.queue_turn(json.dumps({"type": "meta", "event": "queued"}) + "\n")
+
+        agen = ch.subscribe()
+        notice = await agen.__anext__()
+        assert notice[0][0] is None and '"queued"' in notice[0][1]
+
+        nxt = asyncio.ensure_future(agen.__anext__())
+        ch.publish(_chunk(2))
+        ch.publish_eot()                    # end of the running turn
+        await asyncio.sleep(0.01)
+        assert not nxt.done()
+
+        ch.begin_turn(queued=True)
+        seq = ch.publish(_chunk(3))
+        batch = await nxt
+        await agen.aclose()
+        return seq, batch
+
+    seq, batch = _run(scenario())
+    assert batch == [(seq, _chunk(3))]
+
+
+def test_cancelled_queued_turn_releases_listener(vb, tmp_path):
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool")
+        ch.begin_turn()
+        first = ch.publish(_chunk(1))
+        ch.queue_turn(json.dumps({"type": "meta", "event": "queued"}) + "\n")
+        agen = ch.subscribe()
+        await agen.__anext__()
+        nxt = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+        ch.cancel_queued()
+        batch = await nxt
+        await agen.aclose()
+        return first, batch
+
+    first, batch = _run(scenario())
+    assert batch == [(first, _chunk(1))]
+
+
+async def _drain(ch, after=None):
+    """Everything a listener gets up to and including the EOT."""
+    got = []
+    async with aclosing(ch.subscribe(after)) as batches:
+        async for batch in batches:
+            got.extend(batch)
+            if batch[-1][1] == EOT:
+                return got
+
+
+async def _settle(ch):
+    while ch._writer is not None:
+        await asyncio.sleep(0.001)
+
+
+def test_memory_cap_counts_encoded_bytes(vb, tmp_path):
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool", mem_cap=10_000)
+        ch.begin_turn()
+        ch.publish("é" * 100)
+        return ch.mem_bytes
+
+    assert _run(scenario()) == 200
+
+
+def test_spilled_turn_replays_in_order(vb, tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "SPILL_WRITE_BATCH", 2048)
+    monkeypatch.setattr(vb, "SPILL_INDEX_EVERY", 8)
+    monkeypatch.setattr(vb, "SPILL_READ_BATCH", 16)
+
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool", mem_cap=1024)
+        ch.begin_turn()
+        chunks = [_chunk(i) for i in range(500)]
+        for c in chunks:
+            ch.publish(c)
+        eot = ch.publish_eot()
+        await _settle(ch)
+        assert ch.spill_last > 0 and ch.spill_path.exists()
+        assert ch.mem_bytes <= 1024
+
+        full = await _drain(ch)
+        resumed = await _drain(ch, after=123)
+        return chunks, eot, full, resumed
+
+    chunks, eot, full, resumed = _run(scenario())
+    assert full == [(i + 1, c) for i, c in enumerate(chunks)] + [(eot, EOT)]
+    assert [seq for seq, _ in resumed] == list(range(124, eot + 1))
+
+
+def test_unwritten_spill_is_served_from_memory(vb, tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "SPILL_WRITE_BATCH", 1 << 30)
+
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool", mem_cap=256)
+        ch.begin_turn()
+        await _settle(ch)
+        for i in range(50):
+            ch.publish(_chunk(i))
+        ch.publish_eot()
+        assert ch.spill_last == 0 and ch.unwritten_bytes > 0
+        return await _drain(ch)
+
+    got = _run(scenario())
+    assert [seq for seq, _ in got] == list(range(1, 52))
+
+
+def test_new_turn_discards_spill_file(vb, tmp_path, monkeypatch):
+    monkeypatch.setattr(vb, "SPILL_WRITE_BATCH", 512)
+
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool", mem_cap=256)
+        ch.begin_turn()
+        for i in range(100):
+            ch.publish(_chunk(i))
+        ch.publish_eot()
+        await _settle(ch)
+        assert ch.spill_path.exists()
+
+        ch.begin_turn()
+        await _settle(ch)
+        assert not ch.spill_path.exists() and ch.spill_last == 0
+        seq = ch.publish(_chunk("next"))
+        eot = ch.publish_eot()
+        return seq, eot, await _drain(ch)
+
+    seq, eot, got = _run(scenario())
+    assert got == [(seq, _chunk("next")), (eot, EOT)]
+
+
+@pytest.mark.parametrize("write_batch", [512, 1 << 30], ids=["written", "unwritten"])
+def test_spill_cap_reports_gap(vb, tmp_path, monkeypatch, write_batch):
+    monkeypatch.setattr(vb, "SPILL_WRITE_BATCH", write_batch)
+    monkeypatch.setattr(vb, "STREAM_SPILL_CAP", 1024)
+
+    async def scenario():
+        ch = vb.StreamChannel(tmp_path / "s.spool", mem_cap=256)
+        ch.begin_turn()
+        for i in range(200):
+            ch.publish(_chunk(i))
+            await asyncio.sleep(0)
+        ch.publish_eot()
+        await _settle(ch)
+        return ch.dropped, await _drain(ch)
+
+    dropped, got = _run(scenario())
+    assert dropped > 0
+    gaps = [json.loads(c) for seq, c in got if '"gap"' in c]
+    assert len(gaps) == 1 and gaps[0]["resume_from"] - gaps[0]["missed_from"] == dropped
+    assert got[-1][1] == EOT
@@ -0,0 +1,42 @@
+import uuid
+
+
+def _user(vb, rows):
+    uid = f"u-{uuid.uuid4().hex[:8]}"
+    for ts, sid, cost in rows:
+        vb.usage_store.add((ts, uid, sid, cost, 10, 5, 1))
+    return uid
+
+
+def test_totals_and_sessions(vb, client):
+    uid = _user(vb, [(1000.0, "s1", 0.5), (2000.0, "s1", 0.25), (3000.0, "s2", 1.0)])
+    out = client.get(f"/usage/{uid}").json()
+    assert out["totals"]["turns"] == 3
+    assert out["totals"]["cost_usd"] == 1.75
+    assert [s["stream_id"] for s in out["sessions"]] == ["s2", "s1"]
+
+
+def test_window_applies_to_totals_and_sessions(vb, client):
+    uid = _user(vb, [(1000.0, "s1", 0.5), (2000.0, "s1", 0.25), (3000.0, "s2", 1.0)])
+    resp = client.get(f"/usage/{uid}", params={"since": 1500, "until": 3000})
+    assert resp.status_code == 200
+    out = resp.json()
+    assert out["totals"]["turns"] == 1
+    assert out["sessions"] == [dict(out["sessions"][0], stream_id="s1", turns=1)]
+
+    only_since = client.get(f"/usage/{uid}", params={"since": 0}).json()
+    assert {s["stream_id"] for s in only_since["sessions"]} == {"s1", "s2"}
+
+
+def test_bucket_series(vb, client):
+    uid = _user(vb, [(3600.0, "s1", 1.0), (3601.0, "s1", 1.0), (7300.0, "s2", 1.0)])
+    out = client.get(f"/usage/{uid}", params={"bucket": "hour", "since": 3600}).json()
+    assert [(r["bucket"], r["turns"]) for r in out["series"]] == [(3600, 2), (7200, 1)]
+    assert client.get(f"/usage/{uid}", params={"bucket": "week"}).status_code == 400
+
+
+def test_session_usage(vb, client):
+    uid = _user(vb, [(1000.0, "s1", 0.5), (2000.0, "s2", 0.25)])
+    out = client.get(f"/usage/{uid}/sessions/s2", params={"until": 5000}).json()
+    assert out["totals"]["turns"] == 1
+    assert "sessions" not in out